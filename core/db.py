@@ -1,7 +1,7 @@
 import os
 from typing import Any, Dict, Iterable, List, Type
 
-from sqlalchemy import UUID, create_engine
+from sqlalchemy import UUID, create_engine, tuple_
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import sessionmaker
@@ -84,15 +84,18 @@ class DB:
         package_manager_id: UUID,
         package_manager_name: str,
     ) -> List[UUID]:
+        # here and in the other inserts, rows are built as plain dicts of the table's
+        # columns, rather than as ORM models, whose per-row instrumentation the bulk
+        # insert statement never uses
         def process_package(item: Dict[str, str]):
             derived_id = f"{package_manager_name}/{item['name']}"
-            return Package(
-                derived_id=derived_id,
-                name=item["name"],
-                package_manager_id=package_manager_id,
-                import_id=item["import_id"],
-                readme=item["readme"],
-            ).to_dict()
+            return {
+                "derived_id": derived_id,
+                "name": item["name"],
+                "package_manager_id": package_manager_id,
+                "import_id": item["import_id"],
+                "readme": item["readme"],
+            }
 
         batch = []
         for item in package_generator:
@@ -174,16 +177,16 @@ class DB:
             self.logger.warn(f"something weird: {item}")
             return None
 
-        return Version(
-            package_id=package_id,
-            version=item["version"],
-            import_id=item["import_id"],
-            size=item["size"],
-            published_at=item["published_at"],
-            license_id=license_id,
-            downloads=item["downloads"],
-            checksum=item["checksum"],
-        ).to_dict()
+        return {
+            "package_id": package_id,
+            "version": item["version"],
+            "import_id": item["import_id"],
+            "size": item["size"],
+            "published_at": item["published_at"],
+            "license_id": license_id,
+            "downloads": item["downloads"],
+            "checksum": item["checksum"],
+        }
 
     def insert_dependencies(self, dependency_generator: Iterable[dict[str, str]]):
         batch = []
@@ -201,19 +204,19 @@ class DB:
             self._insert_batch(DependsOn, dependencies)
 
     def _process_depends_on(self, item: Dict[str, str]):
-        return DependsOn(
-            version_id=self.version_cache[item["version_id"]],
-            dependency_id=self.package_cache[item["crate_id"]],
-            semver_range=item["semver_range"],
-        ).to_dict()
+        return {
+            "version_id": self.version_cache[item["version_id"]],
+            "dependency_id": self.package_cache[item["crate_id"]],
+            "semver_range": item["semver_range"],
+        }
 
     def insert_users(self, user_generator: Iterable[dict[str, str]], source_id: UUID):
         def process_user(item: Dict[str, str]):
-            return User(
-                username=item["username"],
-                import_id=item["import_id"],
-                source_id=source_id,
-            ).to_dict()
+            return {
+                "username": item["username"],
+                "source_id": source_id,
+                "import_id": item["import_id"],
+            }
 
         batch = []
         for item in user_generator:
@@ -249,10 +252,10 @@ class DB:
             self.logger.warn(f"package {item['crate_id']} not found")
             return None
 
-        return UserPackage(
-            user_id=self.user_cache[item["owner_id"]],
-            package_id=self.package_cache[item["crate_id"]],
-        ).to_dict()
+        return {
+            "user_id": self.user_cache[item["owner_id"]],
+            "package_id": self.package_cache[item["crate_id"]],
+        }
 
     def insert_user_versions(
         self, user_version_generator: Iterable[dict[str, str]], source_id: UUID
@@ -283,10 +286,7 @@ class DB:
                 self.logger.warn(f"version_id not found for {item['version_id']}")
                 return None
 
-            return UserVersion(
-                user_id=user_id,
-                version_id=version_id,
-            ).to_dict()
+            return {"user_id": user_id, "version_id": version_id}
 
         batch = []
         for item in user_version_generator:
@@ -306,7 +306,7 @@ class DB:
 
     def insert_urls(self, url_generator: Iterable[str]):
         def process_url(item: Dict[str, str]):
-            return URL(url=item["url"], url_type_id=item["url_type_id"]).to_dict()
+            return {"url": item["url"], "url_type_id": item["url_type_id"]}
 
         batch = []
         for item in url_generator:
@@ -319,7 +319,7 @@ class DB:
             self._insert_batch(URL, self._process_batch(batch, process_url))
 
     def insert_package_urls(self, package_url_generator: Iterable[dict[str, str]]):
-        url_cache: Dict[tuple[str, str], UUID] = {}
+        url_cache: Dict[tuple[str, UUID], UUID] = {}
 
         def fetch_packages_and_urls(items: List[Dict[str, str]]):
             package_ids = build_query_params(items, self.package_cache, "import_id")
@@ -332,14 +332,12 @@ class DB:
 
             # for url ids, we can't use batch_fetch, because we need to provide the
             # url_type_id in addition to the url string itself
-            # so, let's do it the old fashioned way
-            for item in items:
-                url = item["url"]
-                url_type_id = item["url_type_id"]
-                if (url, url_type_id) not in url_cache:
-                    url_cache[(url, url_type_id)] = self.select_url_by_url_and_type(
-                        url, url_type_id
-                    ).id
+            # so, match on both at once, with one query per batch instead of per url
+            url_keys = {(item["url"], item["url_type_id"]) for item in items}
+            url_keys -= url_cache.keys()
+            if url_keys:
+                urls = self.select_urls_by_url_and_type(url_keys)
+                url_cache.update({(url.url, url.url_type_id): url.id for url in urls})
 
         def process_package_url(item: Dict[str, str]):
             package_id = self.package_cache.get(item["import_id"])
@@ -352,10 +350,7 @@ class DB:
                 self.logger.warn(f"url_id not found for {item['url']}")
                 return None
 
-            return PackageURL(
-                package_id=package_id,
-                url_id=url_id,
-            ).to_dict()
+            return {"package_id": package_id, "url_id": url_id}
 
         batch = []
         for item in package_url_generator:
@@ -509,13 +504,15 @@ class DB:
             if result:
                 return result
 
-    def select_url_by_url_and_type(self, url: str, url_type_id: UUID) -> URL | None:
+    def select_urls_by_url_and_type(
+        self, keys: Iterable[tuple[str, UUID]]
+    ) -> List[URL]:
         with self.session() as session:
-            result = (
-                session.query(URL).filter_by(url=url, url_type_id=url_type_id).first()
+            return (
+                session.query(URL)
+                .filter(tuple_(URL.url, URL.url_type_id).in_(list(keys)))
+                .all()
             )
-            if result:
-                return result
 
     def select_packages_by_import_ids(self, iids: Iterable[str]) -> List[Package]:
         with self.session() as session:
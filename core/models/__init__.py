@@ -56,15 +56,6 @@ class Package(Base):
         DateTime, nullable=False, default=func.now(), server_default=func.now()
     )
 
-    def to_dict(self):
-        return {
-            "derived_id": self.derived_id,
-            "name": self.name,
-            "package_manager_id": self.package_manager_id,
-            "import_id": self.import_id,
-            "readme": self.readme,
-        }
-
 
 class PackageManager(Base):
     __tablename__ = "package_managers"
@@ -120,18 +111,6 @@ class Version(Base):
     package: Mapped["Package"] = relationship()
     license: Mapped["License"] = relationship()
 
-    def to_dict(self):
-        return {
-            "package_id": self.package_id,
-            "version": self.version,
-            "import_id": self.import_id,
-            "size": self.size,
-            "published_at": self.published_at,
-            "license_id": self.license_id,
-            "downloads": self.downloads,
-            "checksum": self.checksum,
-        }
-
 
 class License(Base):
     __tablename__ = "licenses"
@@ -188,14 +167,6 @@ class DependsOn(Base):
     dependency: Mapped["Package"] = relationship()
     dependency_type: Mapped["DependsOnType"] = relationship()
 
-    def to_dict(self):
-        return {
-            "version_id": self.version_id,
-            "dependency_id": self.dependency_id,
-            # "dependency_type_id": self.dependency_type_id,
-            "semver_range": self.semver_range,
-        }
-
 
 class DependsOnType(Base):
     __tablename__ = "depends_on_types"
@@ -272,9 +243,6 @@ class URL(Base):
         DateTime, nullable=False, default=func.now(), server_default=func.now()
     )
 
-    def to_dict(self):
-        return {"url": self.url, "url_type_id": self.url_type_id}
-
 
 # homepage, repository, documentation, etc.
 class URLType(Base):
@@ -320,13 +288,6 @@ class User(Base):
         DateTime, nullable=False, default=func.now(), server_default=func.now()
     )
 
-    def to_dict(self):
-        return {
-            "username": self.username,
-            "source_id": self.source_id,
-            "import_id": self.import_id,
-        }
-
 
 class UserVersion(Base):
     __tablename__ = "user_versions"
@@ -352,12 +313,6 @@ class UserVersion(Base):
         DateTime, nullable=False, default=func.now(), server_default=func.now()
     )
 
-    def to_dict(self):
-        return {
-            "user_id": self.user_id,
-            "version_id": self.version_id,
-        }
-
 
 class UserPackage(Base):
     __tablename__ = "user_packages"
@@ -383,12 +338,6 @@ class UserPackage(Base):
         DateTime, nullable=False, default=func.now(), server_default=func.now()
     )
 
-    def to_dict(self):
-        return {
-            "user_id": self.user_id,
-            "package_id": self.package_id,
-        }
-
 
 class PackageURL(Base):
     __tablename__ = "package_urls"
@@ -411,9 +360,3 @@ class PackageURL(Base):
     updated_at = Column(
         DateTime, nullable=False, default=func.now(), server_default=func.now()
     )
-
-    def to_dict(self):
-        return {
-            "package_id": self.package_id,
-            "url_id": self.url_id,
-        }
@@ -9,3 +9,8 @@ class DependencyType(IntEnum):
 
     def __str__(self):
         return self.name.lower()
+
+
+# dependencies.csv has a row per dependency, so map its raw kind column straight to
+# the enum with one dict lookup, instead of int() and enum construction per row
+DEPENDENCY_TYPES = {str(kind.value): kind for kind in DependencyType}
@@ -1,10 +1,14 @@
 import csv
-from typing import Dict, Generator
+from operator import itemgetter
+from typing import Dict, Generator, Tuple
 
 from core.config import URLTypes, UserTypes
 from core.transformer import Transformer
 from core.utils import safe_int
-from package_managers.crates.structs import DependencyType
+from package_managers.crates.structs import DEPENDENCY_TYPES
+
+# crates.csv's url columns, any of which a dump may leave out
+URL_COLUMNS = ("homepage", "repository", "documentation")
 
 
 # crates provides homepage and repository urls, so we'll initialize this transformer
@@ -24,45 +28,100 @@ class CratesTransformer(Transformer):
         self.url_types = url_types
         self.user_types = user_types
 
-    def _read_csv_rows(self, file_key: str) -> Generator[Dict[str, str], None, None]:
+    def _read_csv_rows(
+        self, file_key: str, *columns: str, optional: Tuple[str, ...] = ()
+    ) -> Generator[Tuple[str, ...], None, None]:
         """
-        Helper method to read rows from a CSV file based on the file key.
-        
+        Helper method to read some columns of a CSV file based on the file key.
+
+        Columns are picked out of each row by position, rather than building a dict
+        of every column for every row (like csv.DictReader does) only to read a few.
+
         Args:
             file_key (str): The key corresponding to the desired CSV file in self.files.
-        
+            *columns (str): The columns to read, in the order they should be yielded.
+            optional (Tuple[str, ...]): Columns the file may not have, read as "".
+
         Yields:
-            Dict[str, str]: A dictionary representing a row in the CSV file.
+            Tuple[str, ...]: The values of the requested columns for a row.
+
+        Raises:
+            KeyError: If the file is missing a column that isn't optional.
         """
         file_path = self.finder(self.files[file_key])
         try:
-            with open(file_path, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    yield row
+            # the dumps are hundreds of MB read front to back, so read 4 MiB at a time
+            f = open(file_path, newline="", encoding="utf-8", buffering=1 << 22)
         except FileNotFoundError:
             self.logger.error(f"File not found: {file_path}")
-        except Exception as e:
-            self.logger.error(f"Error reading {file_path}: {e}")
+            return
+
+        with f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+
+            # a missing column means the dump's schema changed, so don't load around it
+            missing = [c for c in columns if c not in header and c not in optional]
+            if missing:
+                raise KeyError(f"{file_path} has no column(s): {', '.join(missing)}")
+
+            # absent optional columns point one past the header, at a "" pad
+            width = len(header)
+            pad = [""] if any(column not in header for column in columns) else None
+            indices = [header.index(c) if c in header else width for c in columns]
+            if len(indices) == 1:
+                # itemgetter returns a bare value, not a 1-tuple, for a single index
+                def pick(row, index=indices[0]):
+                    return (row[index],)
+            else:
+                pick = itemgetter(*indices)
+
+            try:
+                for row in reader:
+                    # blank lines come through as [], and DictReader skipped them too
+                    if not row:
+                        continue
+                    if len(row) < width:
+                        self.logger.warn(
+                            f"Skipping short row {reader.line_num} of {file_path}"
+                        )
+                        continue
+                    yield pick(row[:width] + pad) if pad else pick(row)
+            except Exception as e:
+                self.logger.error(f"Error reading {file_path}: {e}")
 
     def packages(self) -> Generator[Dict[str, str], None, None]:
-        for row in self._read_csv_rows("projects"):
-            crate_id = row["id"]
-            name = row["name"]
-            readme = row["readme"]
+        for row in self._read_csv_rows("projects", "id", "name", "readme"):
+            crate_id, name, readme = row
 
             yield {"name": name, "import_id": crate_id, "readme": readme}
 
     def versions(self) -> Generator[Dict[str, str], None, None]:
-        for row in self._read_csv_rows("versions"):
-            crate_id = row["crate_id"]
-            version_num = row["num"]
-            version_id = row["id"]
-            crate_size = safe_int(row["crate_size"])
-            created_at = row["created_at"]
-            license = row["license"]
-            downloads = safe_int(row["downloads"])
-            checksum = row["checksum"]
+        columns = (
+            "crate_id",
+            "num",
+            "id",
+            "crate_size",
+            "created_at",
+            "license",
+            "downloads",
+            "checksum",
+        )
+        for row in self._read_csv_rows("versions", *columns):
+            (
+                crate_id,
+                version_num,
+                version_id,
+                crate_size,
+                created_at,
+                license,
+                downloads,
+                checksum,
+            ) = row
+            crate_size = safe_int(crate_size)
+            downloads = safe_int(downloads)
 
             yield {
                 "crate_id": crate_id,
@@ -76,17 +135,13 @@ class CratesTransformer(Transformer):
             }
 
     def dependencies(self) -> Generator[Dict[str, str], None, None]:
-        for row in self._read_csv_rows("dependencies"):
-            start_id = row["version_id"]
-            end_id = row["crate_id"]
-            req = row["req"]
-            kind = int(row["kind"])
-
+        columns = ("version_id", "crate_id", "req", "kind")
+        for row in self._read_csv_rows("dependencies", *columns):
+            start_id, end_id, req, kind = row
 
-            try:
-                # map string to enum
-                dependency_type = DependencyType(kind)
-            except ValueError:
+            # map string to enum
+            dependency_type = DEPENDENCY_TYPES.get(kind)
+            if dependency_type is None:
                 self.logger.warn(f"Unknown dependency kind: {kind}")
                 continue
 
@@ -102,13 +157,14 @@ class CratesTransformer(Transformer):
     # so, we actually get some github data for free here!
     def users(self) -> Generator[Dict[str, str], None, None]:
         usernames = set()
-        for row in self._read_csv_rows("users"):
-            gh_login = row["gh_login"]
-            user_id = row["id"]
+        for row in self._read_csv_rows("users", "gh_login", "id"):
+            gh_login, user_id = row
 
             # Deduplicate based on gh_login
             if gh_login in usernames:
-                self.logger.warn(f"Duplicate username detected: ID={user_id}, Username={gh_login}")
+                self.logger.warn(
+                    f"Duplicate username detected: ID={user_id}, Username={gh_login}"
+                )
                 continue
             usernames.add(gh_login)
 
@@ -121,14 +177,12 @@ class CratesTransformer(Transformer):
     # and owner_kind is 0 for user and 1 for team
     # secondly, created_at is nullable. we'll ignore for now and focus on owners
     def user_packages(self) -> Generator[Dict[str, str], None, None]:
-        for row in self._read_csv_rows("user_packages"):
-            owner_kind = int(row["owner_kind"])
-            if owner_kind == 1:
+        columns = ("owner_kind", "crate_id", "owner_id")
+        for row in self._read_csv_rows("user_packages", *columns):
+            owner_kind, crate_id, owner_id = row
+            if int(owner_kind) == 1:
                 continue  # Skip if owner is a team
 
-            crate_id = row["crate_id"]
-            owner_id = row["owner_id"]
-
             yield {
                 "crate_id": crate_id,
                 "owner_id": owner_id,
@@ -136,9 +190,8 @@ class CratesTransformer(Transformer):
 
     # TODO: reopening files: versions.csv contains all the published_by ids
     def user_versions(self) -> Generator[Dict[str, str], None, None]:
-        for row in self._read_csv_rows("user_versions"):
-            version_id = row["id"]
-            published_by = row["published_by"]
+        for row in self._read_csv_rows("user_versions", "id", "published_by"):
+            version_id, published_by = row
 
             if published_by == "":
                 continue
@@ -147,32 +200,32 @@ class CratesTransformer(Transformer):
 
     # crates provides three urls for each crate: homepage, repository, and documentation
     # however, any of these could be null, so we should check for that
-    # also, we're not going to deduplicate here
+    # also, crates in the same workspace often share urls, so we deduplicate on the
+    # urls table's unique key, rather than sending every copy to the database
     def urls(self) -> Generator[Dict[str, str], None, None]:
-        for row in self._read_csv_rows("urls"):
-            homepage = row.get("homepage", "").strip()
-            repository = row.get("repository", "").strip()
-            documentation = row.get("documentation", "").strip()
+        seen = set()
+        for row in self._read_csv_rows("urls", *URL_COLUMNS, optional=URL_COLUMNS):
+            homepage, repository, documentation = (url.strip() for url in row)
 
-            if homepage:
-                yield {"url": homepage, "url_type_id": self.url_types.homepage}
-
-            if repository:
-                yield {"url": repository, "url_type_id": self.url_types.repository}
+            for url, url_type_id in (
+                (homepage, self.url_types.homepage),
+                (repository, self.url_types.repository),
+                (documentation, self.url_types.documentation),
+            ):
+                if not url or (url, url_type_id) in seen:
+                    continue
+                seen.add((url, url_type_id))
 
-            if documentation:
-                yield {
-                    "url": documentation,
-                    "url_type_id": self.url_types.documentation,
-                }
+                yield {"url": url, "url_type_id": url_type_id}
 
     # TODO: reopening files: crates.csv contains all the urls
     def package_urls(self) -> Generator[Dict[str, str], None, None]:
-        for row in self._read_csv_rows("urls"):
-            crate_id = row["id"]
-            homepage = row.get("homepage", "").strip()
-            repository = row.get("repository", "").strip()
-            documentation = row.get("documentation", "").strip()
+        columns = ("id", *URL_COLUMNS)
+        for row in self._read_csv_rows("urls", *columns, optional=URL_COLUMNS):
+            crate_id, homepage, repository, documentation = row
+            homepage = homepage.strip()
+            repository = repository.strip()
+            documentation = documentation.strip()
 
             if homepage:
                 yield {
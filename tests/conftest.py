@@ -2,8 +2,10 @@
 Common test fixtures and configurations.
 """
 
+import csv
 import uuid
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 import testing.postgresql
@@ -21,17 +23,20 @@ def mock_db():
     Create a mock DB with necessary methods for transformer tests.
     This fixture provides consistent mock objects for URL types and sources.
     """
-    db = MagicMock(spec=DB)
+    db = Mock(spec=DB)
 
     # Mock URL types with consistent UUIDs
-    homepage_type = MagicMock()
-    homepage_type.id = uuid.UUID("00000000-0000-0000-0000-000000000001")
-    repository_type = MagicMock()
-    repository_type.id = uuid.UUID("00000000-0000-0000-0000-000000000002")
-    documentation_type = MagicMock()
-    documentation_type.id = uuid.UUID("00000000-0000-0000-0000-000000000003")
-    source_type = MagicMock()
-    source_type.id = uuid.UUID("00000000-0000-0000-0000-000000000004")
+    # only .id is ever read off these, so plain namespaces stand in for the rows
+    homepage_type = SimpleNamespace(
+        id=uuid.UUID("00000000-0000-0000-0000-000000000001")
+    )
+    repository_type = SimpleNamespace(
+        id=uuid.UUID("00000000-0000-0000-0000-000000000002")
+    )
+    documentation_type = SimpleNamespace(
+        id=uuid.UUID("00000000-0000-0000-0000-000000000003")
+    )
+    source_type = SimpleNamespace(id=uuid.UUID("00000000-0000-0000-0000-000000000004"))
 
     db.select_url_types_homepage.return_value = homepage_type
     db.select_url_types_repository.return_value = repository_type
@@ -39,15 +44,15 @@ def mock_db():
     db.select_url_types_source.return_value = source_type
 
     # Mock sources with consistent UUIDs
-    github_source = MagicMock()
-    github_source.id = uuid.UUID("00000000-0000-0000-0000-000000000005")
-    crates_source = MagicMock()
-    crates_source.id = uuid.UUID("00000000-0000-0000-0000-000000000006")
+    github_source = SimpleNamespace(
+        id=uuid.UUID("00000000-0000-0000-0000-000000000005")
+    )
+    crates_source = SimpleNamespace(
+        id=uuid.UUID("00000000-0000-0000-0000-000000000006")
+    )
 
-    db.select_source_by_name.side_effect = lambda name: {
-        "github": github_source,
-        "crates": crates_source,
-    }[name]
+    sources = {"github": github_source, "crates": crates_source}
+    db.select_source_by_name.side_effect = sources.__getitem__
 
     return db
 
@@ -64,14 +69,35 @@ def user_types(mock_db):
     return UserTypes(mock_db)
 
 
+# Create UUID extension for PostgreSQL
+def create_uuid_function(target, connection, **kw):
+    connection.execute(
+        text("""
+        CREATE OR REPLACE FUNCTION uuid_generate_v4()
+        RETURNS uuid
+        AS $$
+        BEGIN
+            RETURN gen_random_uuid();
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    )
+
+
 @pytest.fixture(scope="class")
 def pg_db():
     """
     Create a temporary PostgreSQL database for integration tests.
     This database is recreated for each test class.
     """
-    with testing.postgresql.Postgresql() as postgresql:
-        yield postgresql
+    # Base.metadata is global, so the listener is added once per temporary database
+    # and removed with it, rather than stacking up a new copy on every db_session
+    event.listen(Base.metadata, "before_create", create_uuid_function)
+    try:
+        with testing.postgresql.Postgresql() as postgresql:
+            yield postgresql
+    finally:
+        event.remove(Base.metadata, "before_create", create_uuid_function)
 
 
 @pytest.fixture
@@ -81,22 +107,6 @@ def db_session(pg_db):
     This fixture handles database initialization and cleanup.
     """
     engine = create_engine(pg_db.url())
-
-    # Create UUID extension for PostgreSQL
-    @event.listens_for(Base.metadata, "before_create")
-    def create_uuid_function(target, connection, **kw):
-        connection.execute(
-            text("""
-            CREATE OR REPLACE FUNCTION uuid_generate_v4()
-            RETURNS uuid
-            AS $$
-            BEGIN
-                RETURN gen_random_uuid();
-            END;
-            $$ LANGUAGE plpgsql;
-        """)
-        )
-
     Base.metadata.create_all(engine)
 
     with Session(engine) as session:
@@ -130,17 +140,99 @@ def db_session(pg_db):
         session.rollback()
 
 
+@pytest.fixture
+def db(pg_db, db_session, monkeypatch):
+    """
+    Create a DB connected to the temporary PostgreSQL database.
+    Takes db_session, so the tables and seed rows exist before it's used.
+    """
+    monkeypatch.setattr("core.db.CHAI_DATABASE_URL", pg_db.url())
+    db = DB()
+    yield db
+    db.engine.dispose()
+
+
 @pytest.fixture
 def mock_csv_reader():
     """
     Fixture to mock CSV reading functionality.
-    Provides a consistent way to mock _read_csv_rows across transformer tests.
+    Provides a consistent way to mock _read_csv_rows across transformer tests: the
+    mock yields data, a single row keyed by column, as a tuple of the columns asked for.
+    Optional columns missing from data read as "", like they do from a file.
     """
 
     def create_mock_reader(data):
-        def mock_reader(file_key):
-            return [data].__iter__()
+        def mock_reader(file_key, *columns, optional=()):
+            row = tuple(
+                data.get(column, "") if column in optional else data[column]
+                for column in columns
+            )
+            return [row].__iter__()
 
         return mock_reader
 
     return create_mock_reader
+
+
+@pytest.fixture(scope="session")
+def crates_dump_dir(tmp_path_factory):
+    """
+    Write a small crates.io dump once for the session, for tests that read real files.
+    Columns are deliberately out of order and padded with ones the transformer skips.
+    """
+    dump = {
+        "crates.csv": [
+            [
+                "created_at",
+                "documentation",
+                "homepage",
+                "id",
+                "name",
+                "readme",
+                "repository",
+            ],
+            [
+                "2015-01-01",
+                "",
+                "https://serde.rs",
+                "123",
+                "serde",
+                "# Serde",
+                "",
+            ],
+        ],
+        "versions.csv": [
+            [
+                "checksum",
+                "crate_id",
+                "crate_size",
+                "created_at",
+                "downloads",
+                "id",
+                "license",
+                "num",
+                "published_by",
+            ],
+            [
+                "abc123",
+                "123",
+                "1000",
+                "2023-01-01",
+                "5000",
+                "456",
+                "MIT",
+                "1.0.0",
+                "",
+            ],
+        ],
+        "dependencies.csv": [
+            ["crate_id", "id", "kind", "optional", "req", "version_id"],
+            ["789", "1", "2", "f", "^1.0", "456"],
+        ],
+    }
+
+    directory = tmp_path_factory.mktemp("crates")
+    for file_name, rows in dump.items():
+        with open(directory / file_name, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+    return directory
@@ -8,114 +8,150 @@ These tests verify the transformation logic from raw data to database models:
 4. User data transformation
 5. URL data transformation
 
-Each test uses a mock CSV reader to simulate data input and verifies
-the correct transformation of that data into the expected format.
+Most tests use a mock CSV reader to simulate data input and verify
+the correct transformation of that data into the expected format. The
+file-backed tests instead read real CSV files, from crates_dump_dir or
+tmp_path, to cover the reader itself: column lookup and malformed rows.
 
 The test data comes from a real row from the crates.io database dump.
 """
 
+import csv
+
 import pytest
 
 from package_managers.crates.structs import DependencyType
 from package_managers.crates.transformer import CratesTransformer
 
+# the url columns of serde's crates.csv row, shared by the url tests
+SERDE_URLS_ROW = {
+    "id": "123",
+    "homepage": "https://serde.rs",
+    "repository": "https://github.com/serde-rs/serde",
+    "documentation": "https://docs.rs/serde",
+}
+
+
+def by_url_type(urls):
+    """Map url_type_id -> url, so all of a row's urls are checked in one assert"""
+    return {url["url_type_id"]: url["url"] for url in urls}
+
 
 @pytest.mark.transformer
 class TestTransformer:
     """Tests for the CratesTransformer class"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def transformer(self, url_types, user_types):
-        """Create a transformer instance with mocked dependencies"""
-        return CratesTransformer(url_types=url_types, user_types=user_types)
-
-    def test_packages_transform(self, transformer, mock_csv_reader):
         """
-        Test package data transformation.
-
-        Verifies:
-        - Basic field mapping (id -> import_id, etc.)
-        - Handling of optional fields (readme)
-        - Data type conversions
+        Create one transformer instance with mocked dependencies for the class.
+        Tests only swap in their own _read_csv_rows, which reset_reader undoes.
         """
-        test_data = {
-            "id": "123",
-            "name": "serde",
-            "readme": "# Serde\nA serialization framework",
-        }
-
-        transformer._read_csv_rows = mock_csv_reader(test_data)
-
-        packages = list(transformer.packages())
-        assert len(packages) == 1
+        return CratesTransformer(url_types=url_types, user_types=user_types)
 
-        package = packages[0]
-        assert package["name"] == "serde"
-        assert package["import_id"] == "123"
-        assert package["readme"] == "# Serde\nA serialization framework"
+    @pytest.fixture(autouse=True)
+    def reset_reader(self, transformer):
+        """Drop the per-test _read_csv_rows override from the shared transformer"""
+        yield
+        transformer.__dict__.pop("_read_csv_rows", None)
+
+    @pytest.fixture(scope="class")
+    def url_type_by_column(self, url_types):
+        """The url type each crates.csv url column should map to"""
+        return {
+            "homepage": url_types.homepage,
+            "repository": url_types.repository,
+            "documentation": url_types.documentation,
+        }
 
-    def test_versions_transform(self, transformer, mock_csv_reader):
+    @pytest.mark.parametrize(
+        "method, test_data, expected",
+        [
+            pytest.param(
+                "packages",
+                {
+                    "id": "123",
+                    "name": "serde",
+                    "readme": "# Serde\nA serialization framework",
+                },
+                {
+                    "name": "serde",
+                    "import_id": "123",
+                    "readme": "# Serde\nA serialization framework",
+                },
+                id="packages",
+            ),
+            pytest.param(
+                "versions",
+                {
+                    "crate_id": "123",
+                    "num": "1.0.0",
+                    "id": "456",
+                    "crate_size": "1000",
+                    "created_at": "2023-01-01T00:00:00Z",
+                    "license": "MIT",
+                    "downloads": "5000",
+                    "checksum": "abc123",
+                },
+                {
+                    "crate_id": "123",
+                    "version": "1.0.0",
+                    "import_id": "456",
+                    "size": 1000,
+                    "published_at": "2023-01-01T00:00:00Z",
+                    "license": "MIT",
+                    "downloads": 5000,
+                    "checksum": "abc123",
+                },
+                id="versions",
+            ),
+            pytest.param(
+                "dependencies",
+                {
+                    "version_id": "456",
+                    "crate_id": "789",
+                    "req": "^1.0",
+                    "kind": "0",  # normal dependency
+                },
+                {
+                    "version_id": "456",
+                    "crate_id": "789",
+                    "semver_range": "^1.0",
+                    "dependency_type": DependencyType(0),
+                },
+                id="dependencies",
+            ),
+            pytest.param(
+                "user_versions",
+                {"id": "version123", "published_by": "user456"},
+                {"version_id": "version123", "published_by": "user456"},
+                id="user_versions",
+            ),
+        ],
+    )
+    def test_single_row_transform(
+        self, transformer, mock_csv_reader, method, test_data, expected
+    ):
         """
-        Test version data transformation.
+        Test the transformations that map one CSV row to one record.
 
         Verifies:
-        - Field mapping from crate fields to version fields
-        - Type conversions (size to int, etc.)
-        - Handling of timestamps
-        - Processing of optional fields
+        - Basic field mapping (id -> import_id, num -> version, etc.)
+        - Type conversions (size and downloads to int, kind to DependencyType)
+        - Handling of optional fields (readme, license)
         """
-        test_data = {
-            "crate_id": "123",
-            "num": "1.0.0",
-            "id": "456",
-            "crate_size": "1000",
-            "created_at": "2023-01-01T00:00:00Z",
-            "license": "MIT",
-            "downloads": "5000",
-            "checksum": "abc123",
-        }
-
         transformer._read_csv_rows = mock_csv_reader(test_data)
 
-        versions = list(transformer.versions())
-        assert len(versions) == 1
+        records = list(getattr(transformer, method)())
+        assert records == [expected]
 
-        version = versions[0]
-        assert version["crate_id"] == "123"
-        assert version["version"] == "1.0.0"
-        assert version["import_id"] == "456"
-        assert version["size"] == 1000
-        assert version["published_at"] == "2023-01-01T00:00:00Z"
-        assert version["license"] == "MIT"
-        assert version["downloads"] == 5000
-        assert version["checksum"] == "abc123"
-
-    def test_dependencies_transform(self, transformer, mock_csv_reader):
-        """
-        Test dependency data transformation.
-
-        Verifies:
-        - Correct mapping of dependency fields
-        - Handling of dependency types
-        - Processing of version requirements
-        """
-        test_data = {
-            "version_id": "456",
-            "crate_id": "789",
-            "req": "^1.0",
-            "kind": "0",  # normal dependency
-        }
+    def test_unknown_dependency_kind_skipped(self, transformer, mock_csv_reader):
+        """Test that a dependency of a kind crates doesn't define is dropped"""
+        test_data = {"version_id": "456", "crate_id": "789", "req": "^1.0", "kind": "9"}
 
         transformer._read_csv_rows = mock_csv_reader(test_data)
 
-        dependencies = list(transformer.dependencies())
-        assert len(dependencies) == 1
-
-        dependency = dependencies[0]
-        assert dependency["version_id"] == "456"
-        assert dependency["crate_id"] == "789"
-        assert dependency["semver_range"] == "^1.0"
-        assert dependency["dependency_type"] == DependencyType(0)
+        assert list(transformer.dependencies()) == []
 
     def test_users_transform(self, transformer, mock_csv_reader):
         """
@@ -138,113 +174,145 @@ class TestTransformer:
         assert user["username"] == "alice"
         assert user["source_id"] == transformer.user_types.github
 
-    def test_package_urls_transform(self, transformer, mock_csv_reader):
+    @pytest.mark.parametrize("method", ["urls", "package_urls"])
+    @pytest.mark.parametrize(
+        "blank",
+        [
+            pytest.param((), id="all-urls"),
+            pytest.param(("homepage",), id="no-homepage"),
+            pytest.param(("repository", "documentation"), id="homepage-only"),
+            pytest.param(("homepage", "repository", "documentation"), id="no-urls"),
+        ],
+    )
+    def test_url_transforms(
+        self, transformer, mock_csv_reader, url_type_by_column, method, blank
+    ):
         """
-        Test package URLs transformation.
+        Test URLs and package URLs transformation.
 
         Verifies:
-        - Creation of separate URL entries for each type
+        - Creation of one URL entry per non-empty url column
         - Correct URL type assignment
         - Handling of missing URLs
+        - Package URLs carry the crate's import_id
         """
-        test_data = {
-            "id": "123",
-            "homepage": "https://serde.rs",
-            "repository": "https://github.com/serde-rs/serde",
-            "documentation": "https://docs.rs/serde",
+        test_data = {**SERDE_URLS_ROW, **dict.fromkeys(blank, "")}
+        expected = {
+            url_type: SERDE_URLS_ROW[column]
+            for column, url_type in url_type_by_column.items()
+            if column not in blank
         }
 
         transformer._read_csv_rows = mock_csv_reader(test_data)
 
-        urls = list(transformer.package_urls())
-        assert len(urls) == 3  # One for each URL type
-
-        # Check homepage URL
-        homepage = next(
-            url for url in urls if url["url_type_id"] == transformer.url_types.homepage
-        )
-        assert homepage["import_id"] == "123"
-        assert homepage["url"] == "https://serde.rs"
-
-        # Check repository URL
-        repo = next(
-            url
-            for url in urls
-            if url["url_type_id"] == transformer.url_types.repository
-        )
-        assert repo["import_id"] == "123"
-        assert repo["url"] == "https://github.com/serde-rs/serde"
-
-        # Check documentation URL
-        docs = next(
-            url
-            for url in urls
-            if url["url_type_id"] == transformer.url_types.documentation
-        )
-        assert docs["import_id"] == "123"
-        assert docs["url"] == "https://docs.rs/serde"
-
-    def test_user_versions_transform(self, transformer, mock_csv_reader):
+        urls = list(getattr(transformer, method)())
+        assert len(urls) == len(expected)  # One for each non-empty URL
+        assert by_url_type(urls) == expected
+        if method == "package_urls":
+            assert all(url["import_id"] == "123" for url in urls)
+
+    def test_urls_deduplicated(self, transformer):
+        """Test that a url shared by several crates is only yielded once"""
+        # two crates of one workspace, sharing their repository and documentation
+        rows = [
+            (
+                "https://serde.rs",
+                "https://github.com/serde-rs/serde",
+                "https://docs.rs",
+            ),
+            ("", "https://github.com/serde-rs/serde", "https://docs.rs"),
+        ]
+        transformer._read_csv_rows = lambda file_key, *columns, optional: iter(rows)
+
+        urls = list(transformer.urls())
+        assert len(urls) == 3
+        assert by_url_type(urls) == {
+            transformer.url_types.homepage: "https://serde.rs",
+            transformer.url_types.repository: "https://github.com/serde-rs/serde",
+            transformer.url_types.documentation: "https://docs.rs",
+        }
+
+    def test_reads_dump_files(self, transformer, crates_dump_dir, monkeypatch):
         """
-        Test user versions data transformation.
+        Test the transforms against real CSV files rather than a mocked reader.
 
         Verifies:
-        - Mapping of version publishing data
-        - Correct handling of user associations
+        - Columns are found by header name, whatever their position
+        - Unused columns are skipped
+        - Empty url columns are dropped
         """
-        test_data = {"id": "version123", "published_by": "user456"}
-
-        transformer._read_csv_rows = mock_csv_reader(test_data)
+        monkeypatch.setattr(transformer, "input", str(crates_dump_dir))
+
+        assert list(transformer.packages()) == [
+            {"name": "serde", "import_id": "123", "readme": "# Serde"}
+        ]
+        assert list(transformer.versions()) == [
+            {
+                "crate_id": "123",
+                "version": "1.0.0",
+                "import_id": "456",
+                "size": 1000,
+                "published_at": "2023-01-01",
+                "license": "MIT",
+                "downloads": 5000,
+                "checksum": "abc123",
+            }
+        ]
+        assert list(transformer.dependencies()) == [
+            {
+                "version_id": "456",
+                "crate_id": "789",
+                "semver_range": "^1.0",
+                "dependency_type": DependencyType.DEV,
+            }
+        ]
+        assert list(transformer.user_versions()) == []
+        assert by_url_type(transformer.urls()) == {
+            transformer.url_types.homepage: "https://serde.rs"
+        }
 
-        user_versions = list(transformer.user_versions())
-        assert len(user_versions) == 1
+    def test_reads_single_column(self, transformer, crates_dump_dir, monkeypatch):
+        """Test that reading one column still yields a tuple per row"""
+        monkeypatch.setattr(transformer, "input", str(crates_dump_dir))
 
-        user_version = user_versions[0]
-        assert user_version["version_id"] == "version123"
-        assert user_version["published_by"] == "user456"
+        assert list(transformer._read_csv_rows("projects", "name")) == [("serde",)]
 
-    def test_urls_transform(self, transformer, mock_csv_reader):
+    def test_reads_malformed_dump_files(
+        self, transformer, tmp_path, monkeypatch, capsys
+    ):
         """
-        Test URLs transformation.
+        Test how the transforms handle dump files that don't match the expected shape.
 
         Verifies:
-        - Extraction of URLs from package data
-        - Correct type assignment for each URL
-        - Handling of all URL types
+        - A short row is skipped with a warning, and the rows after it are still read
+        - A blank line is skipped without one
+        - A missing url column reads as empty, rather than dropping every url
+        - A missing required column raises, rather than loading nothing
         """
-        test_data = {
-            "homepage": "https://serde.rs",
-            "repository": "https://github.com/serde-rs/serde",
-            "documentation": "https://docs.rs/serde",
-        }
-
-        transformer._read_csv_rows = mock_csv_reader(test_data)
-
-        urls = list(transformer.urls())
-        assert len(urls) == 3  # One for each URL type
-
-        # Check that each URL type is present
-        url_types_found = {url["url_type_id"] for url in urls}
-        assert transformer.url_types.homepage in url_types_found
-        assert transformer.url_types.repository in url_types_found
-        assert transformer.url_types.documentation in url_types_found
-
-        # Check specific URLs
-        homepage = next(
-            url for url in urls if url["url_type_id"] == transformer.url_types.homepage
-        )
-        assert homepage["url"] == "https://serde.rs"
-
-        repo = next(
-            url
-            for url in urls
-            if url["url_type_id"] == transformer.url_types.repository
-        )
-        assert repo["url"] == "https://github.com/serde-rs/serde"
-
-        docs = next(
-            url
-            for url in urls
-            if url["url_type_id"] == transformer.url_types.documentation
-        )
-        assert docs["url"] == "https://docs.rs/serde"
+        rows = [
+            ["id", "name", "homepage", "repository"],
+            ["1", "serde", "https://serde.rs", ""],
+            ["2"],
+            [],
+            ["3", "rand", "", "https://github.com/rust-random/rand"],
+        ]
+        with open(tmp_path / "crates.csv", "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+        monkeypatch.setattr(transformer, "input", str(tmp_path))
+
+        assert list(transformer.package_urls()) == [
+            {
+                "import_id": "1",
+                "url": "https://serde.rs",
+                "url_type_id": transformer.url_types.homepage,
+            },
+            {
+                "import_id": "3",
+                "url": "https://github.com/rust-random/rand",
+                "url_type_id": transformer.url_types.repository,
+            },
+        ]
+        assert capsys.readouterr().out.count("Skipping short row") == 1
+
+        with pytest.raises(KeyError, match="readme"):
+            list(transformer.packages())
@@ -0,0 +1,186 @@
+"""
+Unit tests for the DB class, which loads transformed records into the database.
+
+These tests verify that each insert path writes the rows it builds, by reading
+them back through the ORM.
+
+The tests use a temporary PostgreSQL database that is created and destroyed
+for each test class.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from core.models import (
+    DependsOn,
+    Package,
+    PackageManager,
+    PackageURL,
+    Source,
+    URLType,
+    User,
+    UserPackage,
+    UserVersion,
+    Version,
+)
+
+
+@pytest.mark.db
+class TestDB:
+    """Tests for the DB insert paths, against a temporary PostgreSQL database"""
+
+    def test_insert_packages_versions_and_users(self, db, db_session):
+        """
+        Test inserting packages, versions, and users.
+
+        Verifies:
+        - Packages get a derived_id and the package manager's id
+        - Versions are linked to their package, with their license created
+        - Users are written under the given source
+        """
+        package_manager = db_session.query(PackageManager).first()
+        github = db_session.query(Source).filter_by(type="github").first()
+
+        db.insert_packages(
+            iter([{"name": "serde", "import_id": "123", "readme": "# Serde"}]),
+            package_manager.id,
+            "crates",
+        )
+        db.insert_versions(
+            iter(
+                [
+                    {
+                        "crate_id": "123",
+                        "version": "1.0.0",
+                        "import_id": "456",
+                        "size": 1000,
+                        "published_at": "2023-01-01 00:00:00",
+                        "license": "MIT",
+                        "downloads": 5000,
+                        "checksum": "abc123",
+                    }
+                ]
+            )
+        )
+        db.insert_users(iter([{"username": "alice", "import_id": "789"}]), github.id)
+
+        package = db_session.query(Package).filter_by(import_id="123").one()
+        assert package.name == "serde"
+        assert package.derived_id == "crates/serde"
+        assert package.package_manager_id == package_manager.id
+        assert package.readme == "# Serde"
+
+        version = db_session.query(Version).filter_by(import_id="456").one()
+        assert version.package_id == package.id
+        assert version.version == "1.0.0"
+        assert version.size == 1000
+        assert version.published_at == datetime(2023, 1, 1)
+        assert version.license.name == "MIT"
+        assert version.downloads == 5000
+        assert version.checksum == "abc123"
+
+        user = db_session.query(User).filter_by(import_id="789").one()
+        assert user.username == "alice"
+        assert user.source_id == github.id
+
+    def test_insert_package_urls(self, db, db_session):
+        """
+        Test linking packages to urls, which looks urls up by (url, url_type_id).
+
+        Verifies:
+        - A url is matched on both its string and its type
+        - A pair that was never inserted is skipped, not linked or raised on
+        """
+        package_manager = db_session.query(PackageManager).first()
+        homepage = db_session.query(URLType).filter_by(name="homepage").one()
+        repository = db_session.query(URLType).filter_by(name="repository").one()
+
+        db.insert_packages(
+            iter([{"name": "rand", "import_id": "124", "readme": ""}]),
+            package_manager.id,
+            "crates",
+        )
+        db.insert_urls(
+            iter([{"url": "https://rust-random.github.io", "url_type_id": homepage.id}])
+        )
+
+        # the same url as the homepage, but as a repository, was never inserted
+        keys = [
+            ("https://rust-random.github.io", homepage.id),
+            ("https://rust-random.github.io", repository.id),
+        ]
+        urls = db.select_urls_by_url_and_type(keys)
+        assert [(url.url, url.url_type_id) for url in urls] == keys[:1]
+
+        package_urls = [
+            {"import_id": "124", "url": url, "url_type_id": url_type_id}
+            for url, url_type_id in keys
+        ]
+        db.insert_package_urls(iter(package_urls))
+
+        package = db_session.query(Package).filter_by(import_id="124").one()
+        links = db_session.query(PackageURL).filter_by(package_id=package.id).all()
+        assert [link.url_id for link in links] == [urls[0].id]
+
+    def test_insert_dependencies_and_user_links(self, db, db_session):
+        """
+        Test inserting the rows that link packages, versions, and users.
+
+        Verifies:
+        - Dependencies link a version to the package it depends on
+        - User packages link an owner to their package
+        - User versions link a publisher to their version
+        """
+        package_manager = db_session.query(PackageManager).first()
+        github = db_session.query(Source).filter_by(type="github").first()
+
+        packages = [
+            {"name": "tokio", "import_id": "201", "readme": ""},
+            {"name": "bytes", "import_id": "202", "readme": ""},
+        ]
+        db.insert_packages(iter(packages), package_manager.id, "crates")
+        db.insert_versions(
+            iter(
+                [
+                    {
+                        "crate_id": "201",
+                        "version": "1.0.0",
+                        "import_id": "301",
+                        "size": None,
+                        "published_at": None,
+                        "license": "MIT",
+                        "downloads": None,
+                        "checksum": None,
+                    }
+                ]
+            )
+        )
+        db.insert_users(iter([{"username": "bob", "import_id": "401"}]), github.id)
+
+        db.insert_dependencies(
+            iter([{"version_id": "301", "crate_id": "202", "semver_range": "^1.0"}])
+        )
+        db.insert_user_packages(iter([{"crate_id": "201", "owner_id": "401"}]))
+        db.insert_user_versions(
+            iter([{"version_id": "301", "published_by": "401"}]), github.id
+        )
+
+        tokio = db_session.query(Package).filter_by(import_id="201").one()
+        bytes_ = db_session.query(Package).filter_by(import_id="202").one()
+        version = db_session.query(Version).filter_by(import_id="301").one()
+        user = db_session.query(User).filter_by(import_id="401").one()
+
+        dependency = db_session.query(DependsOn).filter_by(version_id=version.id).one()
+        assert dependency.dependency_id == bytes_.id
+        assert dependency.semver_range == "^1.0"
+
+        user_package = (
+            db_session.query(UserPackage).filter_by(package_id=tokio.id).one()
+        )
+        assert user_package.user_id == user.id
+
+        user_version = (
+            db_session.query(UserVersion).filter_by(version_id=version.id).one()
+        )
+        assert user_version.user_id == user.id
@@ -11,6 +11,7 @@ The tests use a temporary PostgreSQL database that is created and destroyed
 for each test class, ensuring test isolation and cleanup.
 """
 
+import itertools
 import uuid
 
 import pytest
@@ -24,14 +25,44 @@ from core.models import (
     Version,
 )
 
+# the tests only need ids and suffixes that are unique within a run, so count
+# instead of paying for os.urandom on every uuid4()
+_ids = itertools.count(1)
 
+
+def fake_uuid() -> uuid.UUID:
+    return uuid.UUID(int=next(_ids))
+
+
+def make_package(package_manager: PackageManager, name: str) -> Package:
+    """Create a Package with an import_id and derived_id unique to this run."""
+    return Package(
+        id=fake_uuid(),
+        import_id=f"pkg{fake_uuid().hex[-8:]}",
+        name=name,
+        package_manager_id=package_manager.id,
+        derived_id=f"crates/{name}-{fake_uuid().hex[-8:]}",
+    )
+
+
+def make_version(package: Package, version: str, **kwargs) -> Version:
+    """Create a Version of package with an import_id unique to this run."""
+    return Version(
+        id=fake_uuid(),
+        import_id=f"ver{fake_uuid().hex[-8:]}",
+        package_id=package.id,
+        version=version,
+        **kwargs,
+    )
+
+
+@pytest.mark.db
 class TestDatabaseModels:
     """
     Unit tests for database models and operations.
     Uses a temporary PostgreSQL database to verify model behavior and relationships.
     """
 
-    @pytest.mark.db
     def test_package_crud(self, db_session):
         """
         Test CRUD operations for Package model.
@@ -49,12 +80,12 @@ class TestDatabaseModels:
 
         # Create
         package = Package(
-            id=uuid.uuid4(),
+            id=fake_uuid(),
             import_id="test123",
             name="test-package",
             readme="Test readme",
             package_manager_id=package_manager.id,
-            derived_id=f"crates/test-package-{uuid.uuid4().hex[:8]}",
+            derived_id=f"crates/test-package-{fake_uuid().hex[-8:]}",
         )
         db_session.add(package)
         db_session.commit()
@@ -73,7 +104,6 @@ class TestDatabaseModels:
         db_session.commit()
         assert db_session.query(Package).filter_by(import_id="test123").first() is None
 
-    @pytest.mark.db
     def test_version_relationships(self, db_session):
         """
         Test relationships between Version and Package models.
@@ -88,25 +118,12 @@ class TestDatabaseModels:
         package_manager = db_session.query(PackageManager).first()
 
         # Create package with unique identifiers
-        import_id = f"pkg{uuid.uuid4().hex[:8]}"
-        derived_id = f"crates/test-package-{uuid.uuid4().hex[:8]}"
-        package = Package(
-            id=uuid.uuid4(),
-            import_id=import_id,
-            name="test-package",
-            package_manager_id=package_manager.id,
-            derived_id=derived_id,
-        )
+        package = make_package(package_manager, "test-package")
         db_session.add(package)
         db_session.commit()
 
         # Create version
-        version = Version(
-            id=uuid.uuid4(),
-            import_id=f"ver{uuid.uuid4().hex[:8]}",
-            package_id=package.id,
-            version="1.0.0",
-        )
+        version = make_version(package, "1.0.0")
         db_session.add(version)
         db_session.commit()
 
@@ -116,7 +133,6 @@ class TestDatabaseModels:
         assert saved_version.package_id == package.id
         assert saved_version.package.name == "test-package"
 
-    @pytest.mark.db
     def test_license_crud(self, db_session):
         """
         Test CRUD operations for License model.
@@ -130,7 +146,7 @@ class TestDatabaseModels:
         """
         # Create
         license = License(
-            id=uuid.uuid4(),
+            id=fake_uuid(),
             name="MIT",
         )
         db_session.add(license)
@@ -143,7 +159,7 @@ class TestDatabaseModels:
 
         # Test unique constraint
         duplicate_license = License(
-            id=uuid.uuid4(),
+            id=fake_uuid(),
             name="MIT",  # Same name as existing license
         )
         db_session.add(duplicate_license)
@@ -167,7 +183,6 @@ class TestDatabaseModels:
         db_session.commit()
         assert db_session.query(License).filter_by(name="Apache-2.0").first() is None
 
-    @pytest.mark.db
     def test_license_version_relationship(self, db_session):
         """
         Test relationships between License and Version models.
@@ -183,33 +198,19 @@ class TestDatabaseModels:
 
         # Create license
         license = License(
-            id=uuid.uuid4(),
+            id=fake_uuid(),
             name="MIT",
         )
         db_session.add(license)
         db_session.commit()
 
         # Create package with unique identifiers
-        import_id = f"pkg{uuid.uuid4().hex[:8]}"
-        derived_id = f"crates/test-package-{uuid.uuid4().hex[:8]}"
-        package = Package(
-            id=uuid.uuid4(),
-            import_id=import_id,
-            name="test-package",
-            package_manager_id=package_manager.id,
-            derived_id=derived_id,
-        )
+        package = make_package(package_manager, "test-package")
         db_session.add(package)
         db_session.commit()
 
         # Create version with license
-        version = Version(
-            id=uuid.uuid4(),
-            package_id=package.id,
-            version="1.0.0",
-            license_id=license.id,
-            import_id=f"ver{uuid.uuid4().hex[:8]}",
-        )
+        version = make_version(package, "1.0.0", license_id=license.id)
         db_session.add(version)
         db_session.commit()
 
@@ -218,7 +219,6 @@ class TestDatabaseModels:
         assert saved_version.license_id == license.id
         assert saved_version.license.name == "MIT"
 
-    @pytest.mark.db
     def test_depends_on_crud(self, db_session):
         """
         Test CRUD operations for DependsOn model.
@@ -236,43 +236,26 @@ class TestDatabaseModels:
 
         # Create dependency type
         dep_type = DependsOnType(
-            id=uuid.uuid4(),
+            id=fake_uuid(),
             name="runtime",
         )
         db_session.add(dep_type)
         db_session.commit()
 
         # Create two packages with unique identifiers
-        package1 = Package(
-            id=uuid.uuid4(),
-            import_id=f"pkg{uuid.uuid4().hex[:8]}",
-            name="package-one",
-            package_manager_id=package_manager.id,
-            derived_id=f"crates/package-one-{uuid.uuid4().hex[:8]}",
-        )
-        package2 = Package(
-            id=uuid.uuid4(),
-            import_id=f"pkg{uuid.uuid4().hex[:8]}",
-            name="package-two",
-            package_manager_id=package_manager.id,
-            derived_id=f"crates/package-two-{uuid.uuid4().hex[:8]}",
-        )
+        package1 = make_package(package_manager, "package-one")
+        package2 = make_package(package_manager, "package-two")
         db_session.add_all([package1, package2])
         db_session.commit()
 
         # Create version for package1
-        version = Version(
-            id=uuid.uuid4(),
-            import_id=f"ver{uuid.uuid4().hex[:8]}",
-            package_id=package1.id,
-            version="1.0.0",
-        )
+        version = make_version(package1, "1.0.0")
         db_session.add(version)
         db_session.commit()
 
         # Create dependency relationship
         dependency = DependsOn(
-            id=uuid.uuid4(),
+            id=fake_uuid(),
             version_id=version.id,
             dependency_id=package2.id,
             dependency_type_id=dep_type.id,
@@ -309,7 +292,6 @@ class TestDatabaseModels:
             is None
         )
 
-    @pytest.mark.db
     def test_depends_on_relationships(self, db_session):
         """
         Test complex relationships between DependsOn and related models.
@@ -327,7 +309,7 @@ class TestDatabaseModels:
         runtime_type = db_session.query(DependsOnType).filter_by(name="runtime").first()
         if not runtime_type:
             runtime_type = DependsOnType(
-                id=uuid.uuid4(),
+                id=fake_uuid(),
                 name="runtime",
             )
             db_session.add(runtime_type)
@@ -335,53 +317,27 @@ class TestDatabaseModels:
         dev_type = db_session.query(DependsOnType).filter_by(name="dev").first()
         if not dev_type:
             dev_type = DependsOnType(
-                id=uuid.uuid4(),
+                id=fake_uuid(),
                 name="dev",
             )
             db_session.add(dev_type)
         db_session.commit()
 
         # Create packages with unique identifiers
-        import_id1 = f"pkg{uuid.uuid4().hex[:8]}"
-        import_id2 = f"pkg{uuid.uuid4().hex[:8]}"
-        derived_id1 = f"crates/test-package-1-{uuid.uuid4().hex[:8]}"
-        derived_id2 = f"crates/test-package-2-{uuid.uuid4().hex[:8]}"
-        package1 = Package(
-            id=uuid.uuid4(),
-            import_id=import_id1,
-            name="test-package-1",
-            package_manager_id=package_manager.id,
-            derived_id=derived_id1,
-        )
-        package2 = Package(
-            id=uuid.uuid4(),
-            import_id=import_id2,
-            name="test-package-2",
-            package_manager_id=package_manager.id,
-            derived_id=derived_id2,
-        )
+        package1 = make_package(package_manager, "test-package-1")
+        package2 = make_package(package_manager, "test-package-2")
         db_session.add_all([package1, package2])
         db_session.commit()
 
         # Create versions with import_ids
-        version1 = Version(
-            id=uuid.uuid4(),
-            package_id=package1.id,
-            version="1.0.0",
-            import_id=f"ver{uuid.uuid4().hex[:8]}",
-        )
-        version2 = Version(
-            id=uuid.uuid4(),
-            package_id=package2.id,
-            version="2.0.0",
-            import_id=f"ver{uuid.uuid4().hex[:8]}",
-        )
+        version1 = make_version(package1, "1.0.0")
+        version2 = make_version(package2, "2.0.0")
         db_session.add_all([version1, version2])
         db_session.commit()
 
         # Create dependency relationship
         depends_on = DependsOn(
-            id=uuid.uuid4(),
+            id=fake_uuid(),
             version_id=version1.id,
             dependency_id=package2.id,
             dependency_type_id=runtime_type.id,